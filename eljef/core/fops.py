@@ -5,28 +5,81 @@
 
 from collections import OrderedDict
 from contextlib import contextmanager
-from pathlib import Path
+from functools import lru_cache
+from typing import Any
 from typing import AnyStr
+from typing import Iterator
+from typing import Tuple
 from typing import Union
 
 import errno
+import io
 import json
 import logging
 import os
+import re
 import shutil
+import stat
+import tempfile
 import xmltodict
 import yaml
 
 from eljef.core import kv
 from eljef.core.strings import makestr
 
+try:
+    from orjson import loads as _orjson_loads
+except ImportError:
+    _orjson_loads = None
+
 LOGGER = logging.getLogger(__name__)
 
+# orjson turns integers wider than 64 bits into floats, so anything with a run of this many digits goes to json
+_JSON_WIDE_NUMBER_RE = re.compile(r'\d{19}')
+
+
+class _YAMLDumper(getattr(yaml, 'CDumper', yaml.Dumper)):  # pylint: disable=too-many-ancestors
+    """YAML dumper, backed by libyaml when available, that writes OrderedDict as a plain mapping"""
+
+
+_YAMLDumper.add_representer(OrderedDict, _YAMLDumper.represent_dict)
+
+# FullLoader, not SafeLoader, so files holding tags such as !!python/tuple written by yaml.dump still load
+_YAMLLoader = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+
+
+def _yaml_dump(data: Union[dict, OrderedDict], **kwargs) -> str:
+    """Dumps ``data`` to a YAML string, using the libyaml backed dumper unless a Dumper is provided."""
+    kwargs.setdefault('Dumper', _YAMLDumper)
+    return yaml.dump(data, **kwargs)
+
+
+def _json_loads(data: str) -> Any:
+    """Parses a JSON string, using orjson when it is installed and gives the same result as json
+
+    Data with integers that may not fit in 64 bits, or that orjson rejects but json accepts (NaN, lone surrogate
+    escapes), is parsed with json.loads.
+
+    Args:
+        data: JSON string to parse.
+
+    Returns:
+        Parsed data.
+    """
+    if _orjson_loads is not None and not _JSON_WIDE_NUMBER_RE.search(data):
+        try:
+            return _orjson_loads(data)
+        except ValueError:
+            pass
+
+    return json.loads(data)
+
+
 __CONV_DATA_TO_STR = {
     'json': json.dumps,
     'kv': kv.dumps,
     'xml': xmltodict.unparse,
-    'yaml': yaml.dump
+    'yaml': _yaml_dump
 }
 
 __CONV_DATA_TO_STR_ARGS = {
@@ -37,14 +90,14 @@
 }
 
 __CONV_STR_TO_DATA = {
-    'json': json.loads,
+    'json': _json_loads,
     'kv': kv.loads,
     'xml': xmltodict.parse,
     'yaml': yaml.load
 }
 
 __CONV_STR_TO_DATA_ARGS = {
-    'yaml': {'Loader': yaml.FullLoader}
+    'yaml': {'Loader': _YAMLLoader}
 }
 
 _ERR_FILE_NOT_TAR = "File is not a compressed tar archive: {0!s}"
@@ -54,6 +107,9 @@
 _ERR_DATA_TYPE = "Unsupported data_type: {0!s}"
 _ERR_NO_DATA = "No data provided"
 
+# Linux transfers at most this many bytes in a single read call
+_MAX_READ = 0x7ffff000
+
 JSON = 'json'
 """JSON data type"""
 KV = 'kv'
@@ -64,25 +120,135 @@
 """YAML data type"""
 
 
-def backup_path(path: str) -> None:
-    """Renames a directory/file/link for backup purposes
+def _read_fd(fd: int) -> bytes:
+    """Reads everything from ``fd`` without going through a buffered file object
 
-    This will append the .bak extension to a file. If ``path``.bak exists, a number is appended until a non-existent
-    file is found.
-    ie: file.bak file.bak.1 file.bak.2
+    Regular files are read with a single read call sized from fstat when possible.
+
+    Args:
+        fd: File descriptor open for reading.
+
+    Returns:
+        Data read from ``fd``.
+    """
+    stats = os.fstat(fd)
+    regular = stat.S_ISREG(stats.st_mode) and stats.st_size > 0
+    read_size = min(stats.st_size + 1, _MAX_READ) if regular else io.DEFAULT_BUFFER_SIZE
+
+    chunks = []
+    chunk = os.read(fd, read_size)
+    while chunk:
+        chunks.append(chunk)
+        if regular and len(chunk) < read_size:
+            break
+        chunk = os.read(fd, read_size)
+
+    return b''.join(chunks)
+
+
+def _walk_files_by_extension(base_path: str, file_ext: str) -> Iterator[Tuple[str, str]]:
+    """Recursively walks ``base_path`` for files ending in ``file_ext``
+
+    Directory entries are read with os.scandir, so file types come from the directory listing rather than a stat call
+    per entry. Symlinks to directories are not followed, and subdirectories that cannot be read are skipped.
+
+    Args:
+        base_path: Full path to the base directory to traverse for files.
+        file_ext: Extension for files to find, without the leading dot.
+
+    Yields:
+        A tuple of the directory containing the file, relative to ``base_path``, and the file name.
+    """
+    suffix = f".{file_ext}"
+    dirs = [('', base_path)]
+    while dirs:
+        rel_dir, full_dir = dirs.pop()
+        try:
+            entries = os.scandir(full_dir)
+        except OSError:
+            # only subdirectories are skipped, errors reading base_path itself go to the caller
+            if not rel_dir:
+                raise
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append((os.path.join(rel_dir, entry.name), entry.path))
+                elif entry.name.endswith(suffix):
+                    yield rel_dir, entry.name
+
+
+def _next_backup_path(path: str) -> str:
+    """Finds the backup path to use for ``path`` with a single read of the parent directory
 
     Args:
         path: Full path to item to back up
+
+    Returns:
+        ``path``.bak if it does not exist, even if numbered backups do, otherwise ``path``.bak.N, where N is one
+        more than the highest existing numbered backup.
+
+    Note:
+        If the parent directory cannot be listed, :func:`_probe_backup_path` is used instead.
     """
     base_back = f"{path}.bak"
+    parent, name = os.path.split(base_back)
+    backup_re = re.compile(rf'{re.escape(name)}(?:\.(\d+))?')
+
+    base_exists = False
+    highest = 0
+    try:
+        entries = os.scandir(parent or '.')
+    except PermissionError:
+        # the parent can be searched but not listed, so probe for backups one at a time instead
+        return _probe_backup_path(base_back)
+    with entries:
+        for entry in entries:
+            match = backup_re.fullmatch(entry.name)
+            if match:
+                if match.group(1) is None:
+                    base_exists = True
+                else:
+                    highest = max(highest, int(match.group(1)))
+
+    if not base_exists:
+        return base_back
+
+    return f"{base_back}.{highest + 1}"
+
+
+def _probe_backup_path(base_back: str) -> str:
+    """Finds the backup path to use by checking for each possible backup in turn
+
+    This only needs search permission on the parent directory, not read permission.
+
+    Args:
+        base_back: ``path``.bak for the item to back up
+
+    Returns:
+        ``base_back`` if it does not exist, otherwise ``base_back``.N, where N is the lowest number not in use.
+    """
     new_path = base_back
     num_backups = 0
+    while os.path.exists(new_path):
+        num_backups += 1
+        new_path = f"{base_back}.{num_backups}"
+
+    return new_path
+
 
+def backup_path(path: str) -> None:
+    """Renames a directory/file/link for backup purposes
+
+    This will append the .bak extension to a file. If ``path``.bak exists, a number one higher than the highest
+    existing numbered backup is appended. ``path``.bak is used whenever it does not exist, even if numbered backups do.
+    ie: file.bak file.bak.1 file.bak.2
+
+    Args:
+        path: Full path to item to back up
+    """
     if os.path.exists(path):
-        if os.path.exists(new_path):
-            while os.path.exists(new_path):
-                num_backups += 1
-                new_path = f"{base_back}.{num_backups}"
+        new_path = _next_backup_path(path)
         LOGGER.debug("Backing up file: %s -> %s", path, new_path)
         os.rename(path, new_path)
 
@@ -104,7 +270,8 @@ def delete(path: str, follow: bool = False, backup: bool = False) -> None:
         retained instead of being deleted. The parent will need to be backed up or deleted separately.
     """
     try:
-        if os.path.islink(path):
+        mode = os.lstat(path).st_mode
+        if stat.S_ISLNK(mode):
             parent = None
             if follow:
                 parent = os.path.realpath(path)
@@ -117,7 +284,7 @@ def delete(path: str, follow: bool = False, backup: bool = False) -> None:
             if backup:
                 backup_path(path)
                 return
-            if os.path.isdir(path):
+            if stat.S_ISDIR(mode):
                 LOGGER.debug("Deleting directory %s", path)
                 shutil.rmtree(path)
             else:
@@ -145,8 +312,16 @@ def file_read(path: str, strip: bool = False) -> str:
         This function replaces unicode errors with "?".
     """
     LOGGER.debug("Read file: %s", path)
-    with open(path, errors='replace', encoding='utf8') as file_data:
-        return file_data.read().strip() if strip else file_data.read()
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = _read_fd(fd).decode('utf8', errors='replace')
+    finally:
+        os.close(fd)
+
+    if '\r' in data:
+        data = data.replace('\r\n', '\n').replace('\r', '\n')
+
+    return data.strip() if strip else data
 
 
 def file_read_convert(path: str, data_type: str, default: bool = False) -> Union[dict, OrderedDict]:
@@ -187,25 +362,127 @@ def file_read_convert(path: str, data_type: str, default: bool = False) -> Union
     return __CONV_STR_TO_DATA[data_type_lower](f_data)
 
 
+def _backup_for_write(path: str) -> None:
+    """Backs up ``path`` before :func:`file_write` replaces it
+
+    ``path`` is hard linked to its backup name, as the write replaces ``path`` with a new file and leaves the linked
+    original untouched. A filesystem without hard link support falls back to :func:`backup_path`.
+
+    Args:
+        path: Full path to the file to back up
+    """
+    new_path = _next_backup_path(path)
+    try:
+        os.link(path, new_path)
+        LOGGER.debug("Backing up file: %s -> %s", path, new_path)
+        return
+    except OSError:
+        pass
+
+    backup_path(path)
+
+
+def _create_replacement(path: str) -> Union[Tuple[int, str], None]:
+    """Creates a temporary file that can atomically replace ``path``
+
+    Only an existing regular file, that is not a symlink and has no other hard links, is replaced. The temporary file
+    is created next to ``path`` and must end up with the same owner and group, so replacing ``path`` changes nothing
+    but its contents.
+
+    Args:
+        path: Full path to the file that is going to be written.
+
+    Returns:
+        A tuple of the open file descriptor and path of the temporary file, or None if ``path`` has to be written in
+        place.
+    """
+    try:
+        stats = os.lstat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(stats.st_mode) or stats.st_nlink != 1:
+        return None
+
+    parent, name = os.path.split(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp('.tmp', f".{name}.", parent or '.')
+    except OSError:
+        return None
+
+    tmp_stats = os.fstat(fd)
+    if (tmp_stats.st_uid, tmp_stats.st_gid) != (stats.st_uid, stats.st_gid):
+        os.close(fd)
+        os.unlink(tmp_path)
+        return None
+
+    os.fchmod(fd, stat.S_IMODE(stats.st_mode))
+    return fd, tmp_path
+
+
+def _write_replacement(path: str, replacement: Tuple[int, str], data: AnyStr, backup: bool, newline: str) -> int:
+    """Writes ``data`` to a temporary file from :func:`_create_replacement` and renames it over ``path``
+
+    Args:
+        path: Full path to the file to write `data` to.
+        replacement: Open file descriptor and path of the temporary file.
+        data: Data to write to ``path``
+        backup: Backup ``path`` before replacing it.
+        newline: Passed to the open function for newline translation.
+
+    Returns:
+        Number of characters written.
+    """
+    fd, tmp_path = replacement
+    try:
+        with os.fdopen(fd, 'w', newline=newline, encoding='utf8') as open_file:
+            if backup:
+                _backup_for_write(path)
+            LOGGER.debug("Write to file: %s", path)
+            total_chars = open_file.write(makestr(data))
+            open_file.flush()
+            os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return total_chars
+
+
 def file_write(path: str, data: AnyStr, backup: bool = False, newline: str = None) -> None:
     """Write ``data`` to a file
 
+    An existing regular file is replaced atomically: data is written to a temporary file next to it, which then
+    replaces it in a single rename, so readers never see a partially written file. The file keeps its permissions,
+    owner, and group.
+
     Args:
         path: Full path to the file to write `data` to.
         data: Data to write to ``path``
         backup: Backup the file before writing to it. (Default is False.)
         newline: Passed to the open function for newline translation. The default
             of None lets native translation happen.
+
+    Note:
+        New files, symlinks, files with other hard links, special files, and files in directories that cannot be
+        written to are written in place instead.
     """
     mode = 'a' if not os.path.isfile(path) else 'w'
+    replacement = _create_replacement(path)
 
-    if backup:
-        backup_path(path)
+    if replacement:
+        total_chars = _write_replacement(path, replacement, data, backup, newline)
+    else:
+        if backup:
+            backup_path(path)
 
-    LOGGER.debug("Write to file: %s", path)
-    with open(path, mode, newline=newline, encoding='utf8') as open_file:
-        total_chars = open_file.write(makestr(data))
-        LOGGER.debug("Wrote %d characters", total_chars)
+        LOGGER.debug("Write to file: %s", path)
+        with open(path, mode, newline=newline, encoding='utf8') as open_file:
+            total_chars = open_file.write(makestr(data))
+
+    LOGGER.debug("Wrote %d characters", total_chars)
 
 
 def file_write_convert_defaults(data_type: str) -> dict:
@@ -234,7 +511,7 @@ def file_write_convert_defaults(data_type: str) -> dict:
                 pretty: True
                 full_document: True,
                 indent: '    '
-            YAML -> yaml.dump (PyYAML):
+            YAML -> yaml.dump (PyYAML, using the libyaml backed Dumper when available):
                 default_flow_style: False
     """
     if data_type.lower() not in __CONV_DATA_TO_STR_ARGS:
@@ -266,6 +543,23 @@ def file_write_convert(path: str, data_type: str, data: Union[dict, OrderedDict]
     file_write(path, write_string, backup=kwargs.get('backup', False), newline='\n')
 
 
+def iter_files_by_extension(base_path: str, file_ext: str) -> Iterator[str]:
+    """Lazily finds files by ``file_ext``, relative to the provided ``base_path``.
+
+    Args:
+        base_path: Full path to the base directory to traverse for files.
+        file_ext: Extension for files to find. This should not contain wild cards or dots.
+
+    Yields:
+        Files by ``file_ext``, relative to the provided ``base_path``, as they are found.
+
+    Note:
+        Directories are only read as the iterator advances, so callers can stop early without scanning the whole tree.
+    """
+    for rel_dir, name in _walk_files_by_extension(base_path, file_ext):
+        yield os.path.join(rel_dir, name)
+
+
 def list_dirs_by_extension(base_path: str, file_ext: str) -> set:
     """Creates a list of directories containing files of ``file_ext``.
 
@@ -278,14 +572,9 @@ def list_dirs_by_extension(base_path: str, file_ext: str) -> set:
         ``base_path``.
 
     Note:
-        Returned paths are relative to ``base_path``.
+        Returned paths are relative to ``base_path``. Files directly in ``base_path`` are reported as '.'.
     """
-    dirs = []
-    with pushd(base_path):
-        for path in Path().rglob(f'*.{file_ext}'):
-            dirs.append(os.path.join(*path.parent.parts))
-
-    return set(dirs)
+    return {rel_dir or '.' for rel_dir, _ in _walk_files_by_extension(base_path, file_ext)}
 
 
 def list_files_by_extension(base_path: str, file_ext: str) -> list:
@@ -301,12 +590,7 @@ def list_files_by_extension(base_path: str, file_ext: str) -> list:
     Note:
         If no files of the type ``file_ext`` are found, an empty list is returned.
     """
-    files = []
-    with pushd(base_path):
-        for path in Path().rglob(f'*.{file_ext}'):
-            files.append(os.path.join(*path.parts))
-
-    return files
+    return list(iter_files_by_extension(base_path, file_ext))
 
 
 @contextmanager
@@ -342,7 +626,27 @@ def required_executables(executables: list) -> None:
 
     Raises:
         SystemExit: When an executable is not found.
+
+    Note:
+        Lookups are cached for the life of the process. Call ``required_executables.cache_clear()`` to look executables
+        up again, such as after $PATH changes.
     """
     for executable in executables:
-        if not shutil.which(executable):
+        if not _which(executable):
             raise SystemExit(f"Required executable not found: {executable}")
+
+
+@lru_cache(maxsize=256)
+def _which(executable: str) -> Union[str, None]:
+    """Cached wrapper around shutil.which
+
+    Args:
+        executable: Executable to find in $PATH.
+
+    Returns:
+        Full path to ``executable``, or None if it is not found.
+    """
+    return shutil.which(executable)
+
+
+required_executables.cache_clear = _which.cache_clear
@@ -3,16 +3,209 @@
 
 """Data Encoding and Hashing"""
 
-import base64
+import errno
 import hashlib
 import logging
+import mmap
+import os
+import sys
 
-from eljef.core import fops
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, BinaryIO, Callable
+
+from eljef.core.strings import makestr
+
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
+
+try:
+    from _hashlib import openssl_md5 as _md5, openssl_sha256 as _sha256, openssl_sha512 as _sha512
+except ImportError:
+    from hashlib import md5 as _md5, sha256 as _sha256, sha512 as _sha512
+
+_HASHERS = {'md5': _md5, 'sha256': _sha256, 'sha512': _sha512}
+
+if sys.version_info >= (3, 9):
+    # these hashes check file contents and are not used for security, which keeps them usable in FIPS mode
+    _HASHERS = {name: partial(hash_new, usedforsecurity=False) for name, hash_new in _HASHERS.items()}
 
 LOGGER = logging.getLogger(__name__)
 
 BLOCK_SIZE = 65536
 
+# a multiple of 3, so no padding is emitted between blocks
+BASE64_BLOCK_SIZE = 3 * 1024 * 1024
+BASE64_MMAP_LIMIT = 64 * 1024 * 1024
+
+# below this, hashlib.file_digest reading into a reused buffer costs less than setting up and faulting in a map
+MMAP_THRESHOLD = 10 * 1024 * 1024
+
+DIRECT_IO_BLOCK_SIZE = 1 << 20
+DIRECT_IO_QUEUE_DEPTH = 4
+DIRECT_IO_THRESHOLD = 64 * 1024 * 1024
+
+_O_DIRECT = getattr(os, 'O_DIRECT', 0)
+
+
+def _fadvise(fd: int, *advice: str) -> None:
+    """Advises the kernel on how the whole of ``fd`` is going to be accessed
+
+    Args:
+        fd: Open file descriptor.
+        advice: Names of os.POSIX_FADV_* constants, without the POSIX_FADV_ prefix.
+
+    Note:
+        This does nothing on platforms without posix_fadvise, or for files that do not support it.
+    """
+    for name in advice:
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, f"POSIX_FADV_{name}"))
+        except (AttributeError, OSError):
+            return
+
+
+def _file_digest_fallback(file_obj: BinaryIO, hash_new: Callable[[], Any]) -> Any:
+    """Fallback for hashlib.file_digest on Python versions older than 3.11
+
+    Args:
+        file_obj: File object opened for reading in binary mode.
+        hash_new: Callable that returns a new hashlib hash object.
+
+    Returns:
+        hashlib hash object updated with the contents of ``file_obj``.
+    """
+    hasher = hash_new()
+    buf = bytearray(BLOCK_SIZE)
+    with memoryview(buf) as view:
+        size = file_obj.readinto(buf)
+        while size:
+            hasher.update(view[:size])
+            size = file_obj.readinto(buf)
+
+    return hasher
+
+
+_file_digest = getattr(hashlib, 'file_digest', _file_digest_fallback)
+
+
+def _hash_bytes(data: bytes, name: str) -> str:
+    """Hashes ``data`` and returns the hex digest
+
+    Args:
+        data: Bytes to hash.
+        name: Name of the hash to use, as a key of ``_HASHERS``.
+
+    Returns:
+        string form of the hash
+    """
+    return makestr(_HASHERS[name](data).hexdigest())
+
+
+def _hash_file(path: str, name: str) -> str:
+    """Hashes the contents of ``path`` and returns the hex digest
+
+    Files larger than ``DIRECT_IO_THRESHOLD`` are read with O_DIRECT where supported, bypassing the page cache.
+    Other files of at least ``MMAP_THRESHOLD`` are memory mapped and handed to the hash in a single update.
+    Everything else is read with hashlib.file_digest.
+
+    Args:
+        path: Full path to file to hash.
+        name: Name of the hash to use, as a key of ``_HASHERS``.
+
+    Returns:
+        string form of the hash
+    """
+    hash_new = _HASHERS[name]
+    with open(path, 'rb', buffering=0) as hash_file:
+        size = os.fstat(hash_file.fileno()).st_size
+        if _O_DIRECT and size > DIRECT_IO_THRESHOLD:
+            hasher = hash_new()
+            if _hash_file_direct(path, hasher):
+                return makestr(hasher.hexdigest())
+
+        if size and size >= MMAP_THRESHOLD:
+            hasher = hash_new()
+            with mmap.mmap(hash_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                hasher.update(mapped)
+            return makestr(hasher.hexdigest())
+
+        _fadvise(hash_file.fileno(), 'SEQUENTIAL', 'WILLNEED')
+        hasher = _file_digest(hash_file, hash_new)
+        _fadvise(hash_file.fileno(), 'DONTNEED')
+
+    return makestr(hasher.hexdigest())
+
+
+def _hash_file_direct(path: str, hasher: Any) -> bool:
+    """Feeds the contents of ``path`` into ``hasher`` using unbuffered O_DIRECT reads
+
+    Reads are done into page aligned anonymous maps, as O_DIRECT requires aligned buffers. A reader thread keeps up to
+    ``DIRECT_IO_QUEUE_DEPTH`` reads in flight, so waiting on storage overlaps with hashing blocks already read.
+
+    Args:
+        path: Full path to file to hash.
+        hasher: hashlib hash object to update.
+
+    Returns:
+        True if ``path`` was hashed, False if the filesystem does not support O_DIRECT and nothing was read.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_DIRECT)
+    except OSError as err:
+        if err.errno == errno.EINVAL:
+            return False
+        raise
+
+    try:
+        return _hash_fd_direct(fd, hasher)
+    finally:
+        os.close(fd)
+
+
+def _hash_fd_direct(fd: int, hasher: Any) -> bool:
+    """Feeds everything from ``fd`` into ``hasher``, keeping multiple reads in flight on a reader thread
+
+    Args:
+        fd: File descriptor opened with O_DIRECT.
+        hasher: hashlib hash object to update.
+
+    Returns:
+        True if ``fd`` was hashed, False if reading failed with EINVAL before anything was read.
+    """
+    buffers = [mmap.mmap(-1, DIRECT_IO_BLOCK_SIZE) for _ in range(DIRECT_IO_QUEUE_DEPTH)]
+    try:
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            offset = 0
+            pending = deque()
+            for buf in buffers:
+                pending.append((buf, reader.submit(os.preadv, fd, [buf], offset)))
+                offset += DIRECT_IO_BLOCK_SIZE
+
+            total = 0
+            while pending:
+                buf, future = pending.popleft()
+                try:
+                    read = future.result()
+                except OSError as err:
+                    if err.errno == errno.EINVAL and not total:
+                        return False
+                    raise
+                hasher.update(memoryview(buf)[:read])
+                total += read
+                if read < DIRECT_IO_BLOCK_SIZE:
+                    return True
+                pending.append((buf, reader.submit(os.preadv, fd, [buf], offset)))
+                offset += DIRECT_IO_BLOCK_SIZE
+
+            return True
+    finally:
+        for buf in buffers:
+            buf.close()
+
 
 def encode_base64(path: str) -> str:
     """Reads ``path`` and converts the data to a base64 encode string
@@ -27,9 +220,33 @@ def encode_base64(path: str) -> str:
         FileNotFoundError: When ``path`` does not exist
         IsADirectoryError: When ``path`` is a directory
     """
-    LOGGER.debug("base64 encoding data from %s", path)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug("base64 encoding data from %s", path)
     with open(path, 'rb') as file_data:
-        return fops.makestr(base64.b64encode(file_data.read()))
+        size = os.fstat(file_data.fileno()).st_size
+        if 0 < size <= BASE64_MMAP_LIMIT:
+            with mmap.mmap(file_data.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return makestr(_b64encode(mapped))
+
+        encoded = bytearray()
+        buf = file_data.read(BASE64_BLOCK_SIZE)
+        while buf:
+            encoded += _b64encode(buf)
+            buf = file_data.read(BASE64_BLOCK_SIZE)
+
+    return makestr(encoded)
+
+
+def encode_base64_bytes(data: bytes) -> str:
+    """Converts ``data`` to a base64 encoded string
+
+    Args:
+        data: Bytes to base64 encode
+
+    Returns:
+        Base64 encoded data as a string
+    """
+    return makestr(_b64encode(data))
 
 
 def hash_md5(path: str) -> str:
@@ -45,15 +262,21 @@ def hash_md5(path: str) -> str:
         FileNotFoundError: When ``path`` does not exist
         IsADirectoryError: When ``path`` is a directory
     """
-    LOGGER.debug("Generating MD5 hash for %s", path)
-    h_md5 = hashlib.md5()
-    with open(path, 'rb') as hash_file:
-        buf = hash_file.read(BLOCK_SIZE)
-        while buf:
-            h_md5.update(buf)
-            buf = hash_file.read(BLOCK_SIZE)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug("Generating MD5 hash for %s", path)
+    return _hash_file(path, 'md5')
+
+
+def hash_md5_bytes(data: bytes) -> str:
+    """Creates a MD5 hash for ``data``
 
-    return fops.makestr(h_md5.hexdigest())
+    Args:
+        data: Bytes to create hash for.
+
+    Returns:
+        string form of MD5 hash
+    """
+    return _hash_bytes(data, 'md5')
 
 
 def hash_sha256(path: str) -> str:
@@ -69,15 +292,21 @@ def hash_sha256(path: str) -> str:
         FileNotFoundError: When ``path`` does not exist
         IsADirectoryError: When ``path`` is a directory
     """
-    LOGGER.debug("Generating SHA256 hash for %s", path)
-    h_sha256 = hashlib.sha256()
-    with open(path, 'rb') as hash_file:
-        buf = hash_file.read(BLOCK_SIZE)
-        while buf:
-            h_sha256.update(buf)
-            buf = hash_file.read(BLOCK_SIZE)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug("Generating SHA256 hash for %s", path)
+    return _hash_file(path, 'sha256')
 
-    return fops.makestr(h_sha256.hexdigest())
+
+def hash_sha256_bytes(data: bytes) -> str:
+    """Creates a SHA256 hash for ``data``
+
+    Args:
+        data: Bytes to create hash for.
+
+    Returns:
+        string form of SHA256 hash
+    """
+    return _hash_bytes(data, 'sha256')
 
 
 def hash_sha512(path: str) -> str:
@@ -93,12 +322,18 @@ def hash_sha512(path: str) -> str:
         FileNotFoundError: When ``path`` does not exist
         IsADirectoryError: When ``path`` is a directory
     """
-    LOGGER.debug("Generating SHA512 hash for %s", path)
-    h_sha512 = hashlib.sha512()
-    with open(path, 'rb') as hash_file:
-        buf = hash_file.read(BLOCK_SIZE)
-        while buf:
-            h_sha512.update(buf)
-            buf = hash_file.read(BLOCK_SIZE)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug("Generating SHA512 hash for %s", path)
+    return _hash_file(path, 'sha512')
+
 
-    return fops.makestr(h_sha512.hexdigest())
+def hash_sha512_bytes(data: bytes) -> str:
+    """Creates a SHA512 hash for ``data``
+
+    Args:
+        data: Bytes to create hash for.
+
+    Returns:
+        string form of SHA512 hash
+    """
+    return _hash_bytes(data, 'sha512')
@@ -5,7 +5,7 @@
 
 from eljef.core.strings import makestr
 
-_COMMENT_CHECKS = [';', '#', '/']
+_COMMENT_CHECKS = frozenset(';#/')
 
 
 def dumps(data: dict, **kwargs) -> str:
@@ -20,16 +20,16 @@ def dumps(data: dict, **kwargs) -> str:
     Raises:
         TypeError: A value is a dictionary, set, or list
     """
-    ret = ''
+    lines = []
     equals_str = '=' if not kwargs.get('spaced', False) else ' = '
 
     for key, value in data.items():
         value_type = type(value)
         if value_type in {dict, list, set}:
             raise TypeError(f"value for key '{key}' is a {value_type}")
-        ret += makestr(key) + equals_str + makestr(value) + '\n'
+        lines.append(makestr(key) + equals_str + makestr(value))
 
-    return ret.strip()
+    return '\n'.join(lines).strip()
 
 
 def loads(data: str, **kwargs) -> dict:
@@ -48,17 +48,15 @@ def loads(data: str, **kwargs) -> dict:
                  will be stripped
     """
     ret = {}
-    new_data = makestr(data.replace('\r\n', '\n')).split('\n')
-    if new_data:
-        for line in new_data:
-            new_line = line.strip()
-            if new_line and new_line[0] not in _COMMENT_CHECKS and '=' in new_line:
-                inline_comment_symbol = kwargs.get('comment')
-                if inline_comment_symbol:
-                    line = new_line.split(inline_comment_symbol, 1)
-                    key, value = line[0].split('=', 1)
-                else:
-                    key, value = new_line.split('=', 1)
-                ret[key.strip()] = value.strip()
+    inline_comment_symbol = kwargs.get('comment')
+    # str.splitlines also splits on form feeds, vertical tabs, and unicode separators, which can appear in values
+    for line in makestr(data).replace('\r\n', '\n').replace('\r', '\n').split('\n'):
+        if inline_comment_symbol:
+            line = line.strip().partition(inline_comment_symbol)[0]
+        key, equals, value = line.partition('=')
+        if equals:
+            key = key.strip()
+            if not key or key[0] not in _COMMENT_CHECKS:
+                ret[key] = value.strip()
 
     return ret
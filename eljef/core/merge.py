@@ -4,24 +4,103 @@
 """Dictionary Merge Operations"""
 
 from copy import deepcopy
+from typing import Any
 
+_IMMUTABLE = frozenset({bool, bytes, complex, float, int, str, type(None)})
+_IMMUTABLE_CONTAINERS = frozenset({frozenset, tuple})
 
-def merge_dictionaries(dict_a: dict, dict_b: dict) -> dict:
-    """Merges two dictionaries, accounting for embedded dictionaries
+
+def _is_immutable(value: Any) -> bool:
+    """Checks if ``value`` can be shared between dictionaries without being copied
+
+    Args:
+        value: value to check
+
+    Returns:
+        True if ``value`` is an immutable builtin, or a tuple/frozenset made up of only immutable builtins.
+    """
+    value_type = type(value)
+    if value_type in _IMMUTABLE:
+        return True
+    if value_type in _IMMUTABLE_CONTAINERS:
+        return all(_is_immutable(item) for item in value)
+
+    return False
+
+
+def _tree_copy(data: dict) -> dict:
+    """Copies a dictionary, only duplicating what can be mutated
+
+    Embedded dictionaries are copied, immutable values are shared with ``data``, and everything else is deep copied.
+
+    Args:
+        data: dictionary to copy
+
+    Returns:
+        A copy of ``data`` that is safe to modify without changing ``data``.
+    """
+    if type(data) is not dict:  # pylint: disable=unidiomatic-typecheck
+        return deepcopy(data)
+
+    new = {}
+    pending = [(new, data)]
+    while pending:
+        target, source = pending.pop()
+        for key, value in source.items():
+            if type(value) is dict:  # pylint: disable=unidiomatic-typecheck
+                target[key] = {}
+                pending.append((target[key], value))
+            elif _is_immutable(value):
+                target[key] = value
+            else:
+                target[key] = deepcopy(value)
+
+    return new
+
+
+def _merge_into(new: dict, dict_b: dict) -> None:
+    """Merges ``dict_b`` into ``new`` in place, accounting for embedded dictionaries
+
+    Args:
+        new: dictionary owned by the caller that is updated with values from ``dict_b``
+        dict_b: dictionary of values to embed into ``new``
+
+    Note:
+        Embedded dictionaries from ``dict_b`` are copied into ``new`` so ``dict_b`` is never modified by later merges.
+        Nesting is walked with an explicit stack, so deeply nested dictionaries do not hit the recursion limit.
+    """
+    pending = [(new, dict_b)]
+    while pending:
+        target, source = pending.pop()
+        for key, value in source.items():
+            if isinstance(value, dict):
+                existing = target.get(key)
+                if not isinstance(existing, dict):
+                    existing = target[key] = {}
+                pending.append((existing, value))
+            else:
+                target[key] = value
+
+
+def merge_dictionaries(dict_a: dict, dict_b: dict, *dicts: dict) -> dict:
+    """Merges dictionaries, accounting for embedded dictionaries
 
     Args:
         dict_a: dictionary to be considered as original
         dict_b: dictionary of values to embed into ``dict_a``
+        dicts: further dictionaries of values to embed, in order, after ``dict_b``. Later dictionaries take precedence.
 
     Returns:
-        A new dictionary with values from ``dict_a`` and ``dict_b``, including embedded dicts.
+        A new dictionary with values from ``dict_a``, ``dict_b``, and ``dicts``, including embedded dicts.
+
+    Note:
+        ``dict_a`` is copied once, then each of the other dictionaries is merged into that copy in turn, instead of
+        building a new intermediate dictionary for every pair.
     """
-    new = deepcopy(dict_a)
+    new = _tree_copy(dict_a)
 
-    for key, value in dict_b.items():
-        if isinstance(value, dict):
-            new[key] = merge_dictionaries(new.get(key, {}), value)
-        else:
-            new[key] = value
+    _merge_into(new, dict_b)
+    for dict_n in dicts:
+        _merge_into(new, dict_n)
 
     return new
@@ -6,9 +6,37 @@
 import ipaddress
 import logging
 
+from socket import AF_INET, AF_INET6, inet_pton
+
 LOGGER = logging.getLogger(__name__)
 
 
+def _ip_version(address: str) -> int:
+    """Finds the IP version of ``address``
+
+    Plain strings are checked with a single inet_pton call, picking the address family by whether ``address``
+    contains a colon. Anything else, including IPv6 addresses with a scope ID, is handed to ipaddress.
+
+    Args:
+        address: IP address to verify.
+
+    Returns:
+        4 if ``address`` is IPv4, or 6 if ``address`` is IPv6.
+
+    Raises:
+        ValueError: If ``address`` is not a valid IP address.
+    """
+    if isinstance(address, str) and '%' not in address:
+        family, version = (AF_INET6, 6) if ':' in address else (AF_INET, 4)
+        try:
+            inet_pton(family, address)
+        except OSError as err:
+            raise ValueError(address) from err
+        return version
+
+    return ipaddress.ip_address(address).version
+
+
 def address_is_ip(address: str) -> int:
     """Checks if ``address`` is an IP address and what version it is.
 
@@ -20,10 +48,10 @@ def address_is_ip(address: str) -> int:
     """
     LOGGER.debug("Validating IP address: %s", address)
     try:
-        ret = ipaddress.ip_address(address)
+        version = _ip_version(address)
     except ValueError:
         LOGGER.warning("Provided address is not a valid IP address: %s", address)
         return 0
 
-    LOGGER.debug("Validated Address %s as IPv%d", address, ret.version)
-    return ret.version
+    LOGGER.debug("Validated Address %s as IPv%d", address, version)
+    return version
@@ -2,16 +2,266 @@
 # SPDX-License-Identifier: 0BSD
 
 """Settings File Operations"""
+import json
 import logging
+import mmap
+import os
+import stat
+import sys
+import tempfile
 
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import lru_cache
 from typing import Any
+from typing import IO
+from typing import List
+from typing import Tuple
 from typing import Union
 
-from eljef.core import fops
 from eljef.core.merge import merge_dictionaries
 
 LOGGER = logging.getLogger(__name__)
 
+JSON_CACHE_SUFFIX = '.cache.json'
+"""Suffix appended to a YAML settings file path to build the path of its JSON cache"""
+YAML_MMAP_THRESHOLD = 128 * 1024
+"""Size in bytes above which YAML settings files are memory mapped for parsing"""
+
+
+@lru_cache(maxsize=32)
+def _cached_load(path: str, stamp: Tuple[int, int, int, int], mode: int, uid: int) -> dict:
+    """Reads and parses a settings file, caching the result
+
+    Files ending in ``.json`` are parsed as JSON. Everything else is parsed as YAML.
+
+    Args:
+        path: Absolute path to settings file.
+        stamp: Freshness stamp of ``path``, from :func:`_file_stamp`. Also used as part of the cache key.
+        mode: Permission bits of ``path``.
+        uid: Owner of ``path``.
+
+    Returns:
+        Parsed data from ``path``. This is shared between callers and must not be modified.
+    """
+    if path.endswith('.json'):
+        return _intern_keys(_json_load(path))
+
+    return _intern_keys(_load_yaml_with_json_cache(path, stamp, mode, uid))
+
+
+def _file_stamp(stats: os.stat_result) -> Tuple[int, int, int, int]:
+    """Builds the freshness stamp used to tell if a settings file changed
+
+    The inode and change time are included alongside the size and modification time, so a same sized edit within
+    one timestamp tick, or a file replaced by rename, is still noticed.
+
+    Args:
+        stats: Result of os.stat on the settings file.
+
+    Returns:
+        A tuple of the inode, size, modification time, and change time of the file.
+    """
+    return stats.st_ino, stats.st_size, stats.st_mtime_ns, stats.st_ctime_ns
+
+
+def _intern_keys(data: dict) -> dict:
+    """Interns the top level string keys of ``data``
+
+    Settings are looked up by these keys, and interned keys let dictionary lookups succeed on identity.
+
+    Args:
+        data: Parsed settings.
+
+    Returns:
+        ``data`` with interned keys.
+    """
+    if not isinstance(data, dict):
+        return data
+
+    return {sys.intern(key) if isinstance(key, str) else key: value for key, value in data.items()}
+
+
+def _json_load(path: str) -> dict:
+    """Parses a JSON file
+
+    Args:
+        path: Full path to JSON file.
+
+    Returns:
+        Parsed data from ``path``, or an empty dictionary if ``path`` is empty.
+    """
+    with open(path, 'rb') as json_file:
+        data = json_file.read()
+
+    return json.loads(data) if data.strip() else {}
+
+
+def _json_cache_allowed(cache_path: str, uid: int) -> bool:
+    """Checks if a JSON cache may be written for a settings file
+
+    Caches are never written by root, so reading system configs does not leave files next to them. Otherwise, the
+    settings file and the directory the cache goes in must both belong to the effective user.
+
+    Args:
+        cache_path: Full path to JSON cache file.
+        uid: Owner of the settings file.
+
+    Returns:
+        True if the cache may be written.
+    """
+    euid = os.geteuid()
+    if euid == 0 or uid != euid:
+        return False
+
+    try:
+        return os.stat(os.path.dirname(cache_path)).st_uid == euid
+    except OSError:
+        return False
+
+
+def _load_yaml_with_json_cache(path: str, stamp: Tuple[int, int, int, int], mode: int, uid: int) -> dict:
+    """Reads and parses a YAML file, using a JSON cache of the parsed data stored next to it
+
+    The cache is only used if it is owned by the owner of ``path`` and was written for a YAML file with the same
+    freshness stamp. Otherwise, the YAML file is parsed and the cache is rewritten, if :func:`_json_cache_allowed`
+    permits it.
+
+    Args:
+        path: Full path to YAML file.
+        stamp: Freshness stamp of ``path``, from :func:`_file_stamp`.
+        mode: Permission bits of ``path``.
+        uid: Owner of ``path``.
+
+    Returns:
+        Parsed data from ``path``.
+    """
+    cache_path = path + JSON_CACHE_SUFFIX
+    try:
+        with open(cache_path, encoding='utf8') as cache_file:
+            if os.fstat(cache_file.fileno()).st_uid == uid:
+                cache = json.load(cache_file)
+                if cache['stamp'] == list(stamp):
+                    LOGGER.debug("Using cached settings from: %s", cache_path)
+                    return cache['data']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = _yaml_load_stream(path)
+    if _json_cache_allowed(cache_path, uid):
+        _write_json_cache(cache_path, {'stamp': list(stamp), 'data': data}, mode)
+
+    return data
+
+
+def _yaml_load(stream: Union[bytes, IO, mmap.mmap]) -> dict:
+    """Parses YAML from ``stream`` with the libyaml backed full loader when available
+
+    Args:
+        stream: YAML data, an open file object, or a memory map of a YAML file.
+
+    Returns:
+        Parsed data from ``stream``, or an empty dictionary if ``stream`` is empty.
+    """
+    # imported here so importing settings does not pay for loading PyYAML until a file is actually parsed
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    return yaml.load(stream, Loader=getattr(yaml, 'CFullLoader', yaml.FullLoader)) or {}
+
+
+def _yaml_load_stream(path: str) -> dict:
+    """Parses a YAML file straight from its file handle
+
+    Args:
+        path: Full path to YAML file.
+
+    Note:
+        Files larger than ``YAML_MMAP_THRESHOLD`` are memory mapped, and the parser reads from the map.
+
+    Returns:
+        Parsed data from ``path``, or an empty dictionary if ``path`` is empty.
+    """
+    with open(path, 'rb') as yaml_file:
+        if os.fstat(yaml_file.fileno()).st_size > YAML_MMAP_THRESHOLD:
+            with mmap.mmap(yaml_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _yaml_load(mapped)
+
+        return _yaml_load(yaml_file)
+
+
+def _write_json_cache(cache_path: str, cache: dict, mode: int) -> None:
+    """Atomically writes a JSON cache of parsed settings
+
+    Nothing is written if the data does not survive a round trip through JSON unchanged, or if the cache cannot be
+    written. The cache is created with a unique name and never has wider permissions than the file it caches.
+
+    Args:
+        cache_path: Full path to JSON cache file.
+        cache: Cache contents.
+        mode: Permission bits of the cached settings file.
+    """
+    try:
+        cache_data = json.dumps(cache)
+        if json.loads(cache_data) != cache:
+            return
+    except (TypeError, ValueError):
+        return
+
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp('.tmp', os.path.basename(cache_path) + '.', os.path.dirname(cache_path))
+        with os.fdopen(fd, 'w', encoding='utf8') as cache_file:
+            os.fchmod(cache_file.fileno(), stat.S_IMODE(mode) & 0o666)
+            cache_file.write(cache_data)
+        os.replace(tmp_path, cache_path)
+    except OSError as err:
+        LOGGER.debug("Could not write settings cache %s: %s", cache_path, err)
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+def _merge_settings(defaults: dict, files: List[dict]) -> dict:
+    """Merges settings read from files over ``defaults``
+
+    Args:
+        defaults: Default settings.
+        files: Settings read from each file, in order of precedence, lowest first.
+
+    Returns:
+        A new dictionary with ``defaults`` overlapped by each of ``files``.
+    """
+    if not files:
+        return deepcopy(defaults)
+
+    return merge_dictionaries(defaults, *files)
+
+
+def _read_settings_file(path: Union[str, IO]) -> dict:
+    """Reads a settings file, only parsing it again if it has changed since the last read
+
+    Args:
+        path: Full path to settings file, or a file-like object holding YAML settings.
+
+    Returns:
+        A copy of the parsed data from ``path``, or an empty dictionary if ``path`` does not exist or cannot be reached.
+
+    Note:
+        File-like objects are parsed from their current position every time, as there is nothing to cache them by.
+    """
+    if hasattr(path, 'read'):
+        return _yaml_load(path)
+
+    try:
+        stats = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        # os.path.exists treats paths that cannot be reached as missing, and so do settings
+        return {}
+
+    return deepcopy(_cached_load(os.path.abspath(path), _file_stamp(stats), stats.st_mode, stats.st_uid))
+
 
 class Settings:
     """Builds a settings object from defaults and a provided settings file.
@@ -21,17 +271,21 @@ class Settings:
 
     Args:
         defaults: Dictionary of default values
-        user_path: Full path to users YAML configuration file.
-        sys_path: Full path to a system-wide YAML configuration file.
+        user_path: Full path to users YAML configuration file, or a file-like object to read it from.
+        sys_path: Full path to a system-wide YAML configuration file, or a file-like object to read it from.
 
     Note:
-        The settings file is expected to be stored as YAML.
+        The settings file is expected to be stored as YAML, or as JSON if its name ends in ``.json``.
         The defaults dictionary should be a complete dictionary, containing all supported settings for the program and
         their default values.
+        Reading a YAML settings file writes a JSON cache of its parsed data next to it, named with
+        ``JSON_CACHE_SUFFIX``, if the process is not running as root and owns both the file and its directory.
     """
-    def __init__(self, defaults: dict, user_path: str = None,
-                 sys_path: str = None) -> None:
-        self._settings = merge_dictionaries(defaults, self.read(sys_path, user_path))
+    __slots__ = ('_settings',)
+
+    def __init__(self, defaults: dict, user_path: Union[str, IO] = None,
+                 sys_path: Union[str, IO] = None) -> None:
+        self._settings = _merge_settings(defaults, self._read_files(sys_path, user_path))
 
     def get(self, setting: str) -> Union[Any, None]:
         """Retrieve a settings value
@@ -53,20 +307,38 @@ def get_all(self) -> dict:
         return self._settings
 
     @staticmethod
-    def read(system_path: str, user_path: str) -> dict:
+    def read(system_path: Union[str, IO], user_path: Union[str, IO]) -> dict:
         """Reads specified yaml configuration files
 
         Args:
-            system_path: Full path to system-wide YAML config file
-            user_path: Full path to users YAML config file
+            system_path: Full path to system-wide YAML config file, or a file-like object to read it from
+            user_path: Full path to users YAML config file, or a file-like object to read it from
 
         Returns:
             A dictionary filled with system settings, overlapped with the user specific settings
+
+        Note:
+            This may write JSON caches next to YAML settings files. See :class:`Settings`.
+        """
+        return _merge_settings({}, Settings._read_files(system_path, user_path))
+
+    @staticmethod
+    def _read_files(system_path: Union[str, IO], user_path: Union[str, IO]) -> List[dict]:
+        """Reads specified yaml configuration files without merging them
+
+        Args:
+            system_path: Full path to system-wide YAML config file, or a file-like object to read it from
+            user_path: Full path to users YAML config file, or a file-like object to read it from
+
+        Returns:
+            A list of the settings read from each provided path, system settings first.
+
+        Note:
+            If both paths are provided, they are read concurrently.
         """
-        ret = {}
-        if system_path:
-            ret = merge_dictionaries(ret, fops.file_read_convert(system_path, 'yaml', True))
-        if user_path:
-            ret = merge_dictionaries(ret, fops.file_read_convert(user_path, 'yaml', True))
+        paths = [path for path in (system_path, user_path) if path]
+        if len(paths) < 2:
+            return [_read_settings_file(path) for path in paths]
 
-        return ret
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            return list(executor.map(_read_settings_file, paths))
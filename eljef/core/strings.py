@@ -5,11 +5,13 @@
 
 from typing import AnyStr
 
+_ENCODED_TYPES = (bytes, bytearray)
+
 
 def makestr(data: AnyStr) -> str:
     """Return a decoded string
 
-    If ``data`` is encoded (bytes), it is decoded before returned.
+    If ``data`` is encoded (bytes or bytearray), it is decoded before returned.
 
     Args:
         data: data to return decoded
@@ -17,7 +19,9 @@ def makestr(data: AnyStr) -> str:
     Returns:
         Decoded string
     """
-    try:
-        return str(data.decode('utf-8'))
-    except AttributeError:
-        return str(data)
+    if isinstance(data, _ENCODED_TYPES):
+        return data.decode('utf-8')
+    if isinstance(data, str):
+        return data
+
+    return str(data)
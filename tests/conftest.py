@@ -0,0 +1,8 @@
+# -*- coding: UTF-8 -*-
+# SPDX-License-Identifier: 0BSD
+
+"""ElJef Test Configuration"""
+
+import logging
+
+logging.disable(logging.CRITICAL)
@@ -2,15 +2,12 @@
 # SPDX-License-Identifier: 0BSD
 """ElJef Application Logging Setup Testing"""
 
-import logging
 import os
 import tempfile
 import unittest
 
 from eljef.core import applog
 
-logging.disable(logging.ERROR)
-
 
 def _get_file() -> str:
     fd, path = tempfile.mkstemp(None, None, tempfile.gettempdir(), True)
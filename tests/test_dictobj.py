@@ -3,13 +3,10 @@
 
 """ElJef Dictionary Object Testing"""
 
-import logging
 import unittest
 
 from eljef.core import dictobj
 
-logging.disable(logging.ERROR)
-
 
 class TestDictObj(unittest.TestCase):
     @staticmethod
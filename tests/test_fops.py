@@ -3,8 +3,9 @@
 
 """ElJef Directory, File, and Filesystem operations testing."""
 
-import logging
 import os
+import shutil
+import stat
 import tempfile
 import unittest
 
@@ -14,34 +15,54 @@
 
 from eljef.core import fops
 
-logging.disable(logging.ERROR)
+_JSON_BYTES = b'{\n    "test": "test"\n}\n'
+_KV_BYTES = b'test=test\n'
+_XML_BYTES = b'<?xml version="1.0"?>\n<test>test</test>\n'
+_YAML_BYTES = b'test: "test"'
 
 
 def _cleanup(*args) -> None:
     for p in args:
-        if os.path.exists(p):
-            fops.delete(p)
+        try:
+            os.unlink(p)
+        except FileNotFoundError:
+            pass
+        except IsADirectoryError:
+            shutil.rmtree(p)
+
+
+class _TempDirTestCase(unittest.TestCase):
+    tmp = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tmp = tempfile.mkdtemp(dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
 
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.tmp, ignore_errors=True)
 
-def _get_empty_file(suffix: str) -> str:
-    path = os.path.join(tempfile.gettempdir(), "testFile.{0!s}".format(suffix))
-    Path(path).touch()
+    def _get_empty_file(self, suffix: str) -> str:
+        path = os.path.join(self.tmp, "testFile.{0!s}".format(suffix))
+        os.close(os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600))
 
-    return path
+        return path
 
+    def _get_file(self, data: str, extension: str) -> str:
+        return self._get_file_bytes(data.encode('UTF-8'), extension)
 
-def _get_file(data: str, extension: str) -> str:
-    fd, path = tempfile.mkstemp(extension, None, tempfile.gettempdir(), True)
-    os.write(fd, data.encode('UTF-8'))
-    os.close(fd)
+    def _get_file_bytes(self, data: bytes, extension: str) -> str:
+        fd, path = tempfile.mkstemp(extension, None, self.tmp, True)
+        os.write(fd, data)
+        os.close(fd)
 
-    return path
+        return path
 
 
 # noinspection PyBroadException
-class TestBackupPath(unittest.TestCase):
+class TestBackupPath(_TempDirTestCase):
     def test_backup_path(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
         expected = "{0!s}.bak".format(path)
 
         fops.backup_path(path)
@@ -54,9 +75,9 @@ def test_backup_path(self):
             raise
 
     def test_backup_path_multiple_files(self):
-        path = _get_empty_file('tmp')
-        path2 = _get_empty_file("tmp.bak")
-        path3 = _get_empty_file("tmp.bak.1")
+        path = self._get_empty_file('tmp')
+        path2 = self._get_empty_file("tmp.bak")
+        path3 = self._get_empty_file("tmp.bak.1")
         expected = "{0!s}.bak.2".format(path)
 
         fops.backup_path(path)
@@ -68,14 +89,58 @@ def test_backup_path_multiple_files(self):
             _cleanup(expected, path, path2, path3)
             raise
 
+    def test_backup_path_after_highest(self):
+        path = self._get_empty_file('tmp')
+        path2 = self._get_empty_file("tmp.bak")
+        path3 = self._get_empty_file("tmp.bak.3")
+        expected = "{0!s}.bak.4".format(path)
+
+        fops.backup_path(path)
+
+        try:
+            self.assertTrue(os.path.isfile(expected))
+            _cleanup(expected, path, path2, path3)
+        except Exception:
+            _cleanup(expected, path, path2, path3)
+            raise
+
+    def test_backup_path_base_missing(self):
+        path = self._get_empty_file('tmp')
+        path2 = self._get_empty_file("tmp.bak.1")
+        expected = "{0!s}.bak".format(path)
+
+        fops.backup_path(path)
+
+        try:
+            self.assertTrue(os.path.isfile(expected))
+            _cleanup(expected, path, path2)
+        except Exception:
+            _cleanup(expected, path, path2)
+            raise
+
+    def test_backup_path_unlistable_dir(self):
+        path = self._get_empty_file('tmp')
+        path2 = self._get_empty_file("tmp.bak")
+        expected = "{0!s}.bak.1".format(path)
+
+        with mock.patch.object(os, 'scandir', side_effect=PermissionError(13, 'Permission denied')):
+            fops.backup_path(path)
+
+        try:
+            self.assertTrue(os.path.isfile(expected))
+            _cleanup(expected, path, path2)
+        except Exception:
+            _cleanup(expected, path, path2)
+            raise
+
 
 # noinspection PyBroadException
-class TestDelete(unittest.TestCase):
+class TestDelete(_TempDirTestCase):
     def test_delete_exception(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
 
         try:
-            with mock.patch('os.remove', new=mock.Mock(side_effect=OSError(5, 'test'))):
+            with mock.patch.object(os, 'remove', side_effect=OSError(5, 'test')):
                 self.assertRaises(OSError, fops.delete, path)
         except Exception:
             _cleanup(path)
@@ -95,7 +160,7 @@ def test_delete_path_does_not_exist(self):
         self.assertFalse(raised)
 
     def test_delete_symlink_only(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
         link = "{0!s}.lnk".format(path)
         os.symlink(path, link)
 
@@ -109,7 +174,7 @@ def test_delete_symlink_only(self):
             raise
 
     def test_delete_symlink_backup(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
         link = "{0!s}.lnk".format(path)
         os.symlink(path, link)
 
@@ -124,7 +189,7 @@ def test_delete_symlink_backup(self):
             raise
 
     def test_delete_symlink_and_parent(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
         link = "{0!s}.lnk".format(path)
         os.symlink(path, link)
 
@@ -139,7 +204,7 @@ def test_delete_symlink_and_parent(self):
             raise
 
     def test_delete_backup(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
         expected = "{0!s}.bak".format(path)
 
         fops.delete(path, backup=True)
@@ -153,7 +218,7 @@ def test_delete_backup(self):
             raise
 
     def test_delete_directory(self):
-        path = os.path.join(tempfile.gettempdir(), "testDir")
+        path = os.path.join(self.tmp, "testDir")
         os.mkdir(path)
 
         fops.delete(path)
@@ -165,7 +230,7 @@ def test_delete_directory(self):
             raise
 
     def test_delete_file(self):
-        path = _get_empty_file('tmp')
+        path = self._get_empty_file('tmp')
 
         fops.delete(path)
 
@@ -177,13 +242,13 @@ def test_delete_file(self):
             raise
 
 
-class TestFileRead(unittest.TestCase):
+class TestFileRead(_TempDirTestCase):
     def test_file_read_no_strip(self):
         data = """test file data
         test file new line
 
         """
-        path = _get_file(data, ".tmp")
+        path = self._get_file(data, ".tmp")
 
         got = fops.file_read(path)
         os.remove(path)
@@ -195,15 +260,24 @@ def test_file_read_strip(self):
         test file new line
 
         """
-        path = _get_file(data, ".tmp")
+        path = self._get_file(data, ".tmp")
 
         got = fops.file_read(path, True)
         os.remove(path)
 
         self.assertEqual(data.strip(), got)
 
+    def test_file_read_newlines(self):
+        data = "test file data\r\ntest file new line\rlast line\n"
+        path = self._get_file(data, ".tmp")
+
+        got = fops.file_read(path)
+        os.remove(path)
 
-class TestFileReadConvert(unittest.TestCase):
+        self.assertEqual("test file data\ntest file new line\nlast line\n", got)
+
+
+class TestFileReadConvert(_TempDirTestCase):
     def test_file_read_convert_unknown_type(self):
         self.assertRaises(ValueError, fops.file_read_convert, 'no_path', 'unknown_type')
 
@@ -221,27 +295,33 @@ def test_file_read_convert_file_does_not_exist_get_default(self):
         self.assertDictEqual(got, want)
 
     def test_file_read_convert_json(self):
-        data = """{
-            "test": "test"
-        }
-        """
         want = {
             'test': 'test'
         }
-        path = _get_file(data, ".json")
+        path = self._get_file_bytes(_JSON_BYTES, ".json")
 
         got = fops.file_read_convert(path, fops.JSON)
         os.remove(path)
 
         self.assertDictEqual(got, want)
 
+    def test_file_read_convert_json_matches_json(self):
+        data = '{"int": 18446744073709551616, "nan": NaN, "surrogate": "\\ud800"}'
+        path = self._get_file(data, ".json")
+
+        got = fops.file_read_convert(path, fops.JSON)
+        os.remove(path)
+
+        self.assertEqual(18446744073709551616, got['int'])
+        self.assertIsInstance(got['int'], int)
+        self.assertNotEqual(got['nan'], got['nan'])
+        self.assertEqual('\ud800', got['surrogate'])
+
     def test_file_read_convert_kv(self):
-        data = """test=test
-        """
         want = {
             'test': 'test'
         }
-        path = _get_file(data, ".tmp")
+        path = self._get_file_bytes(_KV_BYTES, ".tmp")
 
         got = fops.file_read_convert(path, fops.KV)
         os.remove(path)
@@ -249,13 +329,10 @@ def test_file_read_convert_kv(self):
         self.assertDictEqual(got, want)
 
     def test_file_read_convert_xml(self):
-        data = """<?xml version="1.0"?>
-            <test>test</test>
-        """
         want = {
             'test': 'test'
         }
-        path = _get_file(data, ".xml")
+        path = self._get_file_bytes(_XML_BYTES, ".xml")
 
         got = fops.file_read_convert(path, fops.XML)
         os.remove(path)
@@ -263,11 +340,21 @@ def test_file_read_convert_xml(self):
         self.assertDictEqual(got, want)
 
     def test_file_read_convert_yaml(self):
-        data = '''test: "test"'''
         want = {
             'test': 'test'
         }
-        path = _get_file(data, ".yml")
+        path = self._get_file_bytes(_YAML_BYTES, ".yml")
+
+        got = fops.file_read_convert(path, fops.YAML)
+        os.remove(path)
+
+        self.assertDictEqual(got, want)
+
+    def test_file_read_convert_yaml_tuple(self):
+        want = {
+            'test': (1, 2)
+        }
+        path = self._get_file_bytes(b'test: !!python/tuple\n- 1\n- 2\n', ".yml")
 
         got = fops.file_read_convert(path, fops.YAML)
         os.remove(path)
@@ -276,10 +363,10 @@ def test_file_read_convert_yaml(self):
 
 
 # noinspection PyBroadException
-class TestFileWrite(unittest.TestCase):
+class TestFileWrite(_TempDirTestCase):
     def test_file_write_file_does_not_exist(self):
         data = """test data"""
-        path = os.path.join(tempfile.gettempdir(), "testFile.tmp")
+        path = os.path.join(self.tmp, "testFile.tmp")
 
         fops.file_write(path, data, newline='\n')
 
@@ -296,7 +383,7 @@ def test_file_write_file_does_not_exist(self):
 
     def test_file_write_file_exists(self):
         data = """test data"""
-        path = _get_file("testing data", ".tmp")
+        path = self._get_file("testing data", ".tmp")
 
         fops.file_write(path, data, newline='\n')
 
@@ -305,9 +392,53 @@ def test_file_write_file_exists(self):
 
         self.assertEqual(data, got)
 
+    def test_file_write_keeps_mode(self):
+        data = """test data"""
+        path = self._get_file("testing data", ".tmp")
+        os.chmod(path, 0o640)
+
+        fops.file_write(path, data, newline='\n')
+
+        got_mode = stat.S_IMODE(os.stat(path).st_mode)
+        got = fops.file_read(path, strip=True)
+        leftovers = [name for name in os.listdir(self.tmp) if '.tmp.' in name]
+        _cleanup(path)
+
+        self.assertEqual(0o640, got_mode)
+        self.assertEqual(data, got)
+        self.assertListEqual([], leftovers)
+
+    def test_file_write_symlink(self):
+        data = """test data"""
+        path = self._get_file("testing data", ".tmp")
+        link = "{0!s}.lnk".format(path)
+        os.symlink(path, link)
+
+        fops.file_write(link, data, newline='\n')
+
+        is_link = os.path.islink(link)
+        got = fops.file_read(path, strip=True)
+        _cleanup(link, path)
+
+        self.assertTrue(is_link)
+        self.assertEqual(data, got)
+
+    def test_file_write_hard_link(self):
+        data = """test data"""
+        path = self._get_file("testing data", ".tmp")
+        link = "{0!s}.lnk".format(path)
+        os.link(path, link)
+
+        fops.file_write(path, data, newline='\n')
+
+        got = fops.file_read(link, strip=True)
+        _cleanup(link, path)
+
+        self.assertEqual(data, got)
+
     def test_file_write_with_backup(self):
         data = """test data"""
-        path = _get_file("testing data", ".tmp")
+        path = self._get_file("testing data", ".tmp")
         expected = "{0!s}.bak".format(path)
 
         fops.file_write(path, data, backup=True, newline='\n')
@@ -341,7 +472,7 @@ def test_file_write_convert_defaults(self):
 
 
 # noinspection PyBroadException
-class TestFileWriteConvert(unittest.TestCase):
+class TestFileWriteConvert(_TempDirTestCase):
     def test_file_write_convert(self):
         data = {"test": "test"}
         tests = {
@@ -351,7 +482,7 @@ def test_file_write_convert(self):
             fops.YAML: 'test: test'
         }
         for key, value in tests.items():
-            path = os.path.join(tempfile.gettempdir(), "tempFile.{0!s}".format(key))
+            path = os.path.join(self.tmp, "tempFile.{0!s}".format(key))
             args = fops.file_write_convert_defaults(key)
             fops.file_write_convert(path, key, data, dumper_args=args)
 
@@ -366,6 +497,15 @@ def test_file_write_convert(self):
 
             self.assertEqual(value, got, msg=key)
 
+    def test_file_write_convert_yaml_tuple(self):
+        data = {'test': (1, 2)}
+        path = os.path.join(self.tmp, "tempFile.yml")
+
+        fops.file_write_convert(path, fops.YAML, data, dumper_args=fops.file_write_convert_defaults(fops.YAML))
+        got = fops.file_read_convert(path, fops.YAML)
+
+        self.assertDictEqual(data, got)
+
 
 class TestListDirsByExtension(unittest.TestCase):
     def test_list_dirs_by_extension(self):
@@ -403,8 +543,60 @@ def test_list_files_by_extension(self):
         self.assertCountEqual(data, got)
         self.assertListEqual(sorted(data), sorted(got))
 
+    def test_list_files_by_extension_nested(self):
+        path = tempfile.mkdtemp(dir=tempfile.gettempdir())
+        path1 = tempfile.mkdtemp(dir=path)
+        path2 = tempfile.mkdtemp(dir=path1)
+        data = [os.path.join(os.path.basename(path1), 'test1.txt'),
+                os.path.join(os.path.basename(path1), os.path.basename(path2), 'test2.txt')]
+        Path(os.path.join(path1, 'test1.txt')).touch()
+        Path(os.path.join(path2, 'test2.txt')).touch()
+        Path(os.path.join(path2, 'test3.json')).touch()
 
-class TestPushd(unittest.TestCase):
+        got = fops.list_files_by_extension(path, 'txt')
+        _cleanup(path)
+
+        self.assertListEqual(sorted(data), sorted(got))
+
+    def test_list_files_by_extension_missing_base(self):
+        path = os.path.join(tempfile.gettempdir(), 'something_that_should_not_exist')
+        self.assertRaises(FileNotFoundError, fops.list_files_by_extension, path, 'txt')
+        self.assertRaises(FileNotFoundError, fops.list_dirs_by_extension, path, 'txt')
+
+    def test_list_files_by_extension_unreadable(self):
+        path = tempfile.mkdtemp(dir=tempfile.gettempdir())
+        os.mkdir(os.path.join(path, 'locked'))
+        os.mkdir(os.path.join(path, 'ok'))
+        Path(os.path.join(path, 'locked', 'b.txt')).touch()
+        Path(os.path.join(path, 'ok', 'a.txt')).touch()
+        scandir = os.scandir
+
+        def _scandir(dir_path):
+            if os.path.basename(dir_path) == 'locked':
+                raise PermissionError(13, 'Permission denied', dir_path)
+            return scandir(dir_path)
+
+        with mock.patch.object(os, 'scandir', side_effect=_scandir):
+            got = fops.list_files_by_extension(path, 'txt')
+        _cleanup(path)
+
+        self.assertListEqual([os.path.join('ok', 'a.txt')], got)
+
+    def test_iter_files_by_extension(self):
+        path = tempfile.mkdtemp(dir=tempfile.gettempdir())
+        Path(os.path.join(path, 'test1.txt')).touch()
+        Path(os.path.join(path, 'test2.json')).touch()
+
+        got = fops.iter_files_by_extension(path, 'txt')
+        first = next(got)
+        rest = list(got)
+        _cleanup(path)
+
+        self.assertEqual('test1.txt', first)
+        self.assertListEqual([], rest)
+
+
+class TestPushd(_TempDirTestCase):
     def test_pushd_directory_does_not_exist(self):
         def child():
             with fops.pushd('something_that_should_not_exist'):
@@ -413,9 +605,9 @@ def child():
 
     def test_pushd(self):
         data = 'pushd test data'
-        path = os.path.join(tempfile.gettempdir(), 'testFile.tmp')
+        path = os.path.join(self.tmp, 'testFile.tmp')
 
-        with fops.pushd(tempfile.gettempdir()):
+        with fops.pushd(self.tmp):
             fops.file_write('testFile.tmp', data)
 
         got = fops.file_read(path, True)
@@ -440,6 +632,17 @@ def child():
             fops.required_executables(['this_definitely_should_not_exist_at_all'])
         self.assertRaises(SystemExit, child)
 
+    def test_required_executables_cache_clear(self):
+        with mock.patch.object(shutil, 'which', return_value=None) as which:
+            fops.required_executables.cache_clear()
+            self.assertRaises(SystemExit, fops.required_executables, ['this_is_only_looked_up_once'])
+            self.assertRaises(SystemExit, fops.required_executables, ['this_is_only_looked_up_once'])
+            self.assertEqual(which.call_count, 1)
+
+            fops.required_executables.cache_clear()
+            self.assertRaises(SystemExit, fops.required_executables, ['this_is_only_looked_up_once'])
+            self.assertEqual(which.call_count, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
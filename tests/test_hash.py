@@ -3,26 +3,33 @@
 
 """ElJef Data Encoding and Hashing Testing"""
 
-import logging
+import hashlib
 import os
 import tempfile
 import unittest
 
-from eljef.core import hash
-
-logging.disable(logging.ERROR)
+from unittest import mock
 
+from eljef.core import hash
 
-def _get_file() -> str:
-    data = '''some data
+_DATA = '''some data
     some more data
     even more data
-    '''
-    fd, path = tempfile.mkstemp(None, None, tempfile.gettempdir(), True)
-    os.write(fd, data.encode('UTF-8'))
+    '''.encode('UTF-8')
+
+_PATH = None
+_TMP = tempfile.gettempdir()
+
+
+def setUpModule() -> None:
+    global _PATH  # pylint: disable=global-statement
+    fd, _PATH = tempfile.mkstemp(None, None, '/dev/shm' if os.path.isdir('/dev/shm') else None, True)
+    os.write(fd, _DATA)
     os.close(fd)
 
-    return path
+
+def tearDownModule() -> None:
+    os.remove(_PATH)
 
 
 class TestEncodeBase64(unittest.TestCase):
@@ -30,54 +37,109 @@ def test_encode_base64(self):
         # noinspection SpellCheckingInspection
         want = "c29tZSBkYXRhCiAgICBzb21lIG1vcmUgZGF0YQogICAgZXZlbiBtb3JlIGRhdGEKICAgIA=="
 
-        path = _get_file()
-        got = hash.encode_base64(path)
-        os.remove(path)
+        got = hash.encode_base64(_PATH)
+
+        self.assertEqual(want, got)
+
+    def test_encode_base64_bytes(self):
+        # noinspection SpellCheckingInspection
+        want = "c29tZSBkYXRhCiAgICBzb21lIG1vcmUgZGF0YQogICAgZXZlbiBtb3JlIGRhdGEKICAgIA=="
+
+        got = hash.encode_base64_bytes(_DATA)
+
+        self.assertEqual(want, got)
+
+    def test_encode_base64_streamed(self):
+        # noinspection SpellCheckingInspection
+        want = "c29tZSBkYXRhCiAgICBzb21lIG1vcmUgZGF0YQogICAgZXZlbiBtb3JlIGRhdGEKICAgIA=="
+
+        with mock.patch.object(hash, 'BASE64_MMAP_LIMIT', 0), mock.patch.object(hash, 'BASE64_BLOCK_SIZE', 6):
+            got = hash.encode_base64(_PATH)
 
         self.assertEqual(want, got)
 
     def test_encode_base64_file_does_not_exist(self):
         self.assertRaises(FileNotFoundError, hash.encode_base64,
-                          os.path.join(tempfile.gettempdir(), "hopefully_this_file_does_not_exist"))
+                          os.path.join(_TMP, "hopefully_this_file_does_not_exist"))
 
     def test_encode_base64_path_is_directory(self):
-        self.assertRaises(IsADirectoryError, hash.encode_base64, tempfile.gettempdir())
+        self.assertRaises(IsADirectoryError, hash.encode_base64, _TMP)
 
 
 class TestHashMD5(unittest.TestCase):
     def test_hash_md5(self):
         want = "6ab7331490715d56be198f0e0c6079cb"
 
-        path = _get_file()
-        got = hash.hash_md5(path)
-        os.remove(path)
+        got = hash.hash_md5(_PATH)
+
+        self.assertEqual(want, got)
+
+    def test_hash_md5_bytes(self):
+        want = "6ab7331490715d56be198f0e0c6079cb"
+
+        got = hash.hash_md5_bytes(_DATA)
+
+        self.assertEqual(want, got)
+
+    def test_hash_md5_mmap(self):
+        want = "6ab7331490715d56be198f0e0c6079cb"
+
+        with mock.patch.object(hash, 'MMAP_THRESHOLD', 0):
+            got = hash.hash_md5(_PATH)
 
         self.assertEqual(want, got)
 
     def test_hash_md5_file_does_not_exist(self):
         self.assertRaises(FileNotFoundError, hash.hash_md5,
-                          os.path.join(tempfile.gettempdir(), "hopefully_this_file_does_not_exist"))
+                          os.path.join(_TMP, "hopefully_this_file_does_not_exist"))
 
     def test_hash_md5_path_is_directory(self):
-        self.assertRaises(IsADirectoryError, hash.hash_md5, tempfile.gettempdir())
+        self.assertRaises(IsADirectoryError, hash.hash_md5, _TMP)
 
 
 class TestHashSHA256(unittest.TestCase):
     def test_hash_sha256(self):
         want = "d94eb4cb7687832a9115cdfbea0bec0e0006dc2ec518531127d2426ac7d7c276"
 
-        path = _get_file()
-        got = hash.hash_sha256(path)
-        os.remove(path)
+        got = hash.hash_sha256(_PATH)
+
+        self.assertEqual(want, got)
+
+    def test_hash_sha256_bytes(self):
+        want = "d94eb4cb7687832a9115cdfbea0bec0e0006dc2ec518531127d2426ac7d7c276"
+
+        got = hash.hash_sha256_bytes(_DATA)
+
+        self.assertEqual(want, got)
+
+    def test_hash_sha256_direct_io(self):
+        want = "d94eb4cb7687832a9115cdfbea0bec0e0006dc2ec518531127d2426ac7d7c276"
+
+        with mock.patch.object(hash, 'DIRECT_IO_THRESHOLD', 0):
+            got = hash.hash_sha256(_PATH)
+
+        self.assertEqual(want, got)
+
+    def test_hash_sha256_large_file(self):
+        data = bytes(range(256)) * 65536
+        want = hashlib.sha256(data).hexdigest()
+
+        fd, path = tempfile.mkstemp(None, None, os.path.dirname(_PATH), True)
+        os.write(fd, data)
+        os.close(fd)
+        try:
+            got = hash.hash_sha256(path)
+        finally:
+            os.remove(path)
 
         self.assertEqual(want, got)
 
     def test_hash_sha256_file_does_not_exist(self):
         self.assertRaises(FileNotFoundError, hash.hash_sha256,
-                          os.path.join(tempfile.gettempdir(), "hopefully_this_file_does_not_exist"))
+                          os.path.join(_TMP, "hopefully_this_file_does_not_exist"))
 
     def test_hash_sha256_path_is_directory(self):
-        self.assertRaises(IsADirectoryError, hash.hash_sha256, tempfile.gettempdir())
+        self.assertRaises(IsADirectoryError, hash.hash_sha256, _TMP)
 
 
 class TestHashSHA512(unittest.TestCase):
@@ -86,18 +148,35 @@ def test_hash_sha512(self):
         want = "d0dc6749ab8d63d5c1e3d19153150755beca1bec0b1ce14b6f8d1c36ceae4" \
                "ed9f0f398428187d7dbd17af7f72d27ad4fb83cc15270dec24c1a91444e9443402b"
 
-        path = _get_file()
-        got = hash.hash_sha512(_get_file())
-        os.remove(path)
+        got = hash.hash_sha512(_PATH)
+
+        self.assertEqual(want, got)
+
+    def test_hash_sha512_bytes(self):
+        # noinspection SpellCheckingInspection
+        want = "d0dc6749ab8d63d5c1e3d19153150755beca1bec0b1ce14b6f8d1c36ceae4" \
+               "ed9f0f398428187d7dbd17af7f72d27ad4fb83cc15270dec24c1a91444e9443402b"
+
+        got = hash.hash_sha512_bytes(_DATA)
+
+        self.assertEqual(want, got)
+
+    def test_hash_sha512_file_digest_fallback(self):
+        # noinspection SpellCheckingInspection
+        want = "d0dc6749ab8d63d5c1e3d19153150755beca1bec0b1ce14b6f8d1c36ceae4" \
+               "ed9f0f398428187d7dbd17af7f72d27ad4fb83cc15270dec24c1a91444e9443402b"
+
+        with mock.patch.object(hash, '_file_digest', hash._file_digest_fallback):
+            got = hash.hash_sha512(_PATH)
 
         self.assertEqual(want, got)
 
     def test_hash_sha512_file_does_not_exist(self):
         self.assertRaises(FileNotFoundError, hash.hash_sha512,
-                          os.path.join(tempfile.gettempdir(), "hopefully_this_file_does_not_exist"))
+                          os.path.join(_TMP, "hopefully_this_file_does_not_exist"))
 
     def test_hash_sha512_path_is_directory(self):
-        self.assertRaises(IsADirectoryError, hash.hash_sha512, tempfile.gettempdir())
+        self.assertRaises(IsADirectoryError, hash.hash_sha512, _TMP)
 
 
 if __name__ == '__main__':
@@ -3,13 +3,10 @@
 
 """ElJef Key/Value Reading/Writing Testing"""
 
-import logging
 import unittest
 
 from eljef.core import kv
 
-logging.disable(logging.ERROR)
-
 
 class TestDumps(unittest.TestCase):
     def test_dumps_no_spaces(self):
@@ -117,6 +114,24 @@ def test_loads_inline_comments(self):
         got = kv.loads(input_data, comment='#')
         self.assertDictEqual(want, got)
 
+    def test_loads_bytes_crlf(self):
+        input_data = b'test=test\r\ntest2=test2\r\n'
+        want = {
+            'test': 'test',
+            'test2': 'test2'
+        }
+        got = kv.loads(input_data)
+        self.assertDictEqual(want, got)
+
+    def test_loads_control_characters(self):
+        input_data = 'name=caf\x85e\ntest=a\x0bb\x0cc\x1cd\u2028e\u2029f\n'
+        want = {
+            'name': 'caf\x85e',
+            'test': 'a\x0bb\x0cc\x1cd\u2028e\u2029f'
+        }
+        got = kv.loads(input_data)
+        self.assertDictEqual(want, got)
+
 
 if __name__ == '__main__':
     unittest.main()
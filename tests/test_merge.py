@@ -3,13 +3,11 @@
 
 """ElJef Merge Testing"""
 
-import logging
+import sys
 import unittest
 
 from eljef.core import merge
 
-logging.disable(logging.ERROR)
-
 
 class TestMergeDictionaries(unittest.TestCase):
     def test_merge_dictionaries(self):
@@ -86,9 +84,96 @@ def test_merge_dictionaries(self):
                 }
             }
         ]
-        for test in tests:
-            got = merge.merge_dictionaries(test['dict_a'], test['dict_b'])
-            self.assertDictEqual(got, test['want'])
+        for i, test in enumerate(tests):
+            with self.subTest(i=i):
+                got = merge.merge_dictionaries(test['dict_a'], test['dict_b'])
+                self.assertDictEqual(got, test['want'])
+
+    def test_merge_dictionaries_multiple(self):
+        dict_a = {
+            'test': {
+                'test2': 'test3'
+            }
+        }
+        dict_b = {
+            'test': {
+                'test4': 'test5'
+            },
+            'test6': 'test7'
+        }
+        dict_c = {
+            'test': {
+                'test2': 'test8'
+            },
+            'test6': {
+                'test9': 'test10'
+            }
+        }
+        want = {
+            'test': {
+                'test2': 'test8',
+                'test4': 'test5'
+            },
+            'test6': {
+                'test9': 'test10'
+            }
+        }
+
+        got = merge.merge_dictionaries(dict_a, dict_b, dict_c)
+        self.assertDictEqual(got, want)
+        self.assertDictEqual(dict_b, {'test': {'test4': 'test5'}, 'test6': 'test7'})
+
+    def test_merge_dictionaries_keywords(self):
+        want = {
+            'test': {
+                'test2': 'test3',
+                'test4': 'test5'
+            }
+        }
+
+        got = merge.merge_dictionaries(dict_a={'test': {'test2': 'test3'}}, dict_b={'test': {'test4': 'test5'}})
+        self.assertDictEqual(got, want)
+
+    def test_merge_dictionaries_does_not_modify_original(self):
+        dict_a = {
+            'test': {
+                'test2': ['test3'],
+                'test4': ('test5', 6),
+            },
+            'test7': {'test8'}
+        }
+        want = {
+            'test': {
+                'test2': ['test3'],
+                'test4': ('test5', 6),
+            },
+            'test7': {'test8'}
+        }
+
+        got = merge.merge_dictionaries(dict_a, {})
+        self.assertDictEqual(got, want)
+
+        got['test']['test2'].append('test9')
+        got['test']['test10'] = 'test11'
+        got['test7'].add('test12')
+        self.assertDictEqual(dict_a, want)
+
+    def test_merge_dictionaries_deeply_nested(self):
+        depth = sys.getrecursionlimit() * 2
+        dict_a = {}
+        dict_b = {}
+        level_a = dict_a
+        level_b = dict_b
+        for _ in range(depth):
+            level_a = level_a.setdefault('test', {})
+            level_b = level_b.setdefault('test', {})
+        level_a['test2'] = 'test3'
+        level_b['test4'] = 'test5'
+
+        got = merge.merge_dictionaries(dict_a, dict_b)
+        for _ in range(depth):
+            got = got['test']
+        self.assertDictEqual(got, {'test2': 'test3', 'test4': 'test5'})
 
 
 if __name__ == '__main__':
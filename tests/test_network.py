@@ -3,13 +3,11 @@
 
 """ElJef Network operations testing"""
 
-import logging
+import sys
 import unittest
 
 from eljef.core import network
 
-logging.disable(logging.ERROR)
-
 
 class TestAddressIsIp(unittest.TestCase):
     def test_address_empty(self):
@@ -24,6 +22,13 @@ def test_address_is4(self):
     def test_address_is6(self):
         self.assertEqual(network.address_is_ip("::ffff:c0a8:101"), 6)
 
+    def test_address_is6_invalid(self):
+        self.assertEqual(network.address_is_ip(":::"), 0)
+
+    @unittest.skipIf(sys.version_info < (3, 9), 'ipaddress only accepts IPv6 scope IDs from Python 3.9')
+    def test_address_is6_scoped(self):
+        self.assertEqual(network.address_is_ip("fe80::1%eth0"), 6)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,25 +3,51 @@
 
 """ElJef Settings Handling"""
 
-import logging
+import io
 import os
+import shutil
+import stat
 import tempfile
 import unittest
 
+from unittest import mock
+
+from eljef.core import settings
 from eljef.core.settings import Settings
 
-logging.disable(logging.ERROR)
+_TMP = tempfile.gettempdir()
+# caches are never written as root, so cache tests run as this user when the suite itself runs as root
+_USER = 65534 if os.geteuid() == 0 else os.geteuid()
 
 
 class TestSettings(unittest.TestCase):
     @staticmethod
-    def _get_file(data: str) -> str:
-        fd, path = tempfile.mkstemp(".yaml", None, tempfile.gettempdir(), True)
+    def _get_file(data: str, suffix: str = ".yaml") -> str:
+        fd, path = tempfile.mkstemp(suffix, None, _TMP, True)
         os.write(fd, data.encode('UTF-8'))
         os.close(fd)
 
         return path
 
+    @staticmethod
+    def _get_user_file(data: str, chown_dir: bool = True) -> str:
+        tmp_dir = tempfile.mkdtemp(dir=_TMP)
+        path = os.path.join(tmp_dir, 'settings.yaml')
+        with open(path, 'w', encoding='UTF-8') as open_file:
+            open_file.write(data)
+        if os.geteuid() == 0:
+            os.chown(path, _USER, -1)
+            if chown_dir:
+                os.chown(tmp_dir, _USER, -1)
+
+        return path
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        for p in (path, path + settings.JSON_CACHE_SUFFIX):
+            if os.path.exists(p):
+                os.remove(p)
+
     def test_init_settings_files_dont_exist(self):
         defaults = {
             'test': 'test'
@@ -30,6 +56,34 @@ def test_init_settings_files_dont_exist(self):
         t = Settings(defaults, '', '')
         got = t.get_all()
         self.assertDictEqual(got, defaults)
+        self.assertIsNot(got, defaults)
+
+    def test_init_settings_files_unreachable(self):
+        defaults = {
+            'test': 'test'
+        }
+
+        path = self._get_file("{'test': 'user'}")
+        with mock.patch.object(os, 'stat', side_effect=PermissionError(13, 'Permission denied')):
+            t = Settings(defaults, os.path.join(path, 'settings.yaml'), os.path.join(path, 'settings.yaml'))
+        got = t.get_all()
+        not_a_dir = Settings(defaults, os.path.join(path, 'settings.yaml')).get_all()
+        self._remove_file(path)
+        self.assertDictEqual(got, defaults)
+        self.assertDictEqual(not_a_dir, defaults)
+
+    def test_init_does_not_modify_defaults(self):
+        defaults = {
+            'test': {
+                'test2': 'test'
+            }
+        }
+
+        path = io.StringIO("{'test': {'test2': 'user'}, 'user': 'user'}")
+        t = Settings(defaults, path, '')
+
+        self.assertDictEqual(defaults, {'test': {'test2': 'test'}})
+        self.assertDictEqual(t.get_all(), {'test': {'test2': 'user'}, 'user': 'user'})
 
     def test_init_only_user_file(self):
         defaults = {
@@ -40,13 +94,23 @@ def test_init_only_user_file(self):
             'user': 'user'
         }
 
-        path = self._get_file("{'user': 'user'}")
+        path = io.StringIO("{'user': 'user'}")
         t = Settings(defaults, path, '')
-        os.remove(path)
 
         got = t.get_all()
         self.assertDictEqual(got, want)
 
+    def test_init_empty_user_file(self):
+        defaults = {
+            'test': 'test'
+        }
+
+        path = io.StringIO("")
+        t = Settings(defaults, path, '')
+
+        got = t.get_all()
+        self.assertDictEqual(got, defaults)
+
     def test_init_only_system_file(self):
         defaults = {
             'test': 'test'
@@ -56,9 +120,8 @@ def test_init_only_system_file(self):
             'sys': 'sys'
         }
 
-        path = self._get_file("{'sys': 'sys'}")
-        t = Settings(defaults, path, '')
-        os.remove(path)
+        path = io.StringIO("{'sys': 'sys'}")
+        t = Settings(defaults, '', path)
 
         got = t.get_all()
         self.assertDictEqual(got, want)
@@ -73,11 +136,9 @@ def test_init_user_and_system_file(self):
             'user': 'user',
         }
 
-        s_path = self._get_file("{'sys': 'sys'}")
-        u_path = self._get_file("{'user': 'user'}")
+        s_path = io.StringIO("{'sys': 'sys'}")
+        u_path = io.StringIO("{'user': 'user'}")
         t = Settings(defaults, u_path, s_path)
-        os.remove(s_path)
-        os.remove(u_path)
 
         got = t.get_all()
         self.assertDictEqual(got, want)
@@ -102,8 +163,112 @@ def test_read(self):
 
         path = self._get_file("{'test': 'test'}")
         got = Settings.read(path, '')
-        os.remove(path)
+        self._remove_file(path)
+        self.assertDictEqual(want, got)
+
+    def test_read_cached(self):
+        want = {
+            'test': ['test']
+        }
+
+        path = self._get_file("{'test': ['test']}")
+        got = Settings.read(path, '')
+        got['test'].append('test2')
+        got = Settings.read(path, '')
+        self.assertDictEqual(want, got)
+
+        with open(path, 'w', encoding='utf8') as open_file:
+            open_file.write("{'test': 'changed'}")
+        got = Settings.read(path, '')
+        self._remove_file(path)
+        self.assertDictEqual({'test': 'changed'}, got)
+
+    def test_read_json(self):
+        want = {
+            'test': {
+                'test2': 'test'
+            }
+        }
+
+        path = self._get_file('{"test": {"test2": "test"}}', ".json")
+        got = Settings.read(path, '')
+        cache_exists = os.path.exists(path + settings.JSON_CACHE_SUFFIX)
+        self._remove_file(path)
         self.assertDictEqual(want, got)
+        self.assertFalse(cache_exists)
+
+    def test_read_json_wide_int(self):
+        path = self._get_file('{"test": 18446744073709551616}', ".json")
+        got = Settings.read(path, '')
+        self._remove_file(path)
+        self.assertIsInstance(got['test'], int)
+        self.assertEqual(18446744073709551616, got['test'])
+
+    def test_read_mmap(self):
+        want = {
+            'test': 'test'
+        }
+
+        path = self._get_file("{'test': 'test'}")
+        with mock.patch.object(settings, 'YAML_MMAP_THRESHOLD', 0):
+            got = settings._yaml_load_stream(path)
+        self._remove_file(path)
+        self.assertDictEqual(want, got)
+
+    def test_read_json_cache(self):
+        want = {
+            'test': 'test'
+        }
+
+        path = self._get_user_file("{'test': 'test'}")
+        with mock.patch.object(os, 'geteuid', return_value=_USER):
+            Settings.read(path, '')
+            cache_exists = os.path.isfile(path + settings.JSON_CACHE_SUFFIX)
+            settings._cached_load.cache_clear()
+            got = Settings.read(path, '')
+        shutil.rmtree(os.path.dirname(path))
+        self.assertTrue(cache_exists)
+        self.assertDictEqual(want, got)
+
+    def test_read_json_cache_mode(self):
+        path = self._get_user_file("{'password': 'test'}")
+        os.chmod(path, 0o600)
+        with mock.patch.object(os, 'geteuid', return_value=_USER):
+            Settings.read(path, '')
+        cache_path = path + settings.JSON_CACHE_SUFFIX
+        got = stat.S_IMODE(os.stat(cache_path).st_mode) if os.path.isfile(cache_path) else None
+        shutil.rmtree(os.path.dirname(path))
+        self.assertEqual(0o600, got)
+
+    def test_read_json_cache_not_owner(self):
+        want = {
+            'test': 'test'
+        }
+
+        path = self._get_user_file("{'test': 'test'}")
+        with mock.patch.object(os, 'geteuid', return_value=_USER + 1):
+            got = Settings.read(path, '')
+        cache_exists = os.path.exists(path + settings.JSON_CACHE_SUFFIX)
+        shutil.rmtree(os.path.dirname(path))
+        self.assertDictEqual(want, got)
+        self.assertFalse(cache_exists)
+
+    @unittest.skipIf(os.geteuid() != 0, 'changing file owners needs root')
+    def test_read_json_cache_dir_not_owner(self):
+        path = self._get_user_file("{'test': 'test'}", chown_dir=False)
+        with mock.patch.object(os, 'geteuid', return_value=_USER):
+            Settings.read(path, '')
+        cache_exists = os.path.exists(path + settings.JSON_CACHE_SUFFIX)
+        shutil.rmtree(os.path.dirname(path))
+        self.assertFalse(cache_exists)
+
+    def test_read_json_cache_root(self):
+        path = self._get_file("{'test': 'test'}")
+        with mock.patch.object(os, 'geteuid', return_value=0):
+            Settings.read(path, '')
+        cache_exists = os.path.exists(path + settings.JSON_CACHE_SUFFIX)
+        self._remove_file(path)
+        self.assertFalse(cache_exists)
 
 
 if __name__ == '__main__':
@@ -3,15 +3,11 @@
 
 """ElJef String Testing Operations"""
 
-import logging
 import unittest
 
 from eljef.core import strings
 
 
-logging.disable(logging.ERROR)
-
-
 class TestMakeStr(unittest.TestCase):
     def test_makestr_str(self):
         self.assertEqual(strings.makestr(str("tests")), str("tests"))
@@ -19,6 +15,12 @@ def test_makestr_str(self):
     def test_makestr_utf8(self):
         self.assertEqual(strings.makestr(str("tests").encode("UTF-8")), str("tests"))
 
+    def test_makestr_bytearray(self):
+        self.assertEqual(strings.makestr(bytearray(str("tests").encode("UTF-8"))), str("tests"))
+
+    def test_makestr_other(self):
+        self.assertEqual(strings.makestr(5), str("5"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,13 +3,10 @@
 
 """ElJef Version Test"""
 
-import logging
 import unittest
 
 from eljef.core import __version__
 
-logging.disable(logging.ERROR)
-
 
 class TestVersion(unittest.TestCase):
     def test_version(self):